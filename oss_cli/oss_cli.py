@@ -2,12 +2,13 @@ import argparse
 
 from .oss_config import OSSConfig
 from .oss_operator import OSSOperator
+from .utils import setup_logger
 
 
 def get_args():
     """
     参数获取函数
-    包括模式-a,文件夹模式-d,源路径-s,目标路径-t,config选择-c,自定义config路径-cp
+    包括模式-a,文件夹模式-d,源路径-s,目标路径-t,config选择-c,自定义config路径-cp,详细日志-v
     """
     # 参数读取
     parser = argparse.ArgumentParser(description="Simple OSS CLI")
@@ -36,6 +37,8 @@ def get_args():
     parser.add_argument(
         "--cp", type=str, help="config_path", default=None, required=False
     )
+    # 输出每个文件的操作日志 非必须
+    parser.add_argument("--v", help="verbose", action="store_true")
 
     args = parser.parse_args()
 
@@ -48,6 +51,7 @@ def main():
     """
     # 参数读取
     args = get_args()
+    setup_logger(verbose=args.v)
 
     config_store = OSSConfig(config_name=args.config_name)
     operator = OSSOperator(config_store.config)
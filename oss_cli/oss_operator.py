@@ -1,11 +1,210 @@
+import atexit
+import fnmatch
+import functools
+import http.client
+import logging
 import os
+import posixpath
 import re
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from io import BytesIO
+from itertools import islice
+from typing import Iterable, Iterator
+from urllib.parse import urlparse
 
+import botocore.session
+import urllib3.connection
 from boto3 import Session
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
 from botocore.exceptions import ClientError
 
+# aws-crt 为可选依赖,安装后大文件上传使用 CRT 传输
+try:
+    from s3transfer.crt import (
+        BotocoreCRTCredentialsWrapper,
+        BotocoreCRTRequestSerializer,
+        CRTTransferManager,
+        create_s3_crt_client,
+    )
+
+    HAS_CRT = True
+except ImportError:
+    HAS_CRT = False
+
+logger = logging.getLogger(__name__)
+
+# delete_objects 接口单次请求的对象数量上限
+DELETE_BATCH_SIZE = 1000
+# 客户端连接池大小,需覆盖多文件并发与分片并发
+MAX_POOL_CONNECTIONS = 50
+# 默认并发上传下载的线程数
+DEFAULT_MAX_WORKERS = 16
+# 单个文件分片传输的最大并发数
+TRANSFER_CONCURRENCY = 20
+# 超过该大小的文件在 aws-crt 可用时使用 CRT 上传
+CRT_THRESHOLD = 100 * 1024 * 1024
+# 服务端不支持对应接口时返回的错误码
+UNSUPPORTED_ERROR_CODES = ("405", "501", "MethodNotAllowed", "NotImplemented")
+# client 配置与连接参数无关,导入时只构建一次
+CLIENT_CONFIG = Config(
+    s3={"addressing_style": "path"},
+    signature_version="s3v4",
+    max_pool_connections=MAX_POOL_CONNECTIONS,
+    retries={"max_attempts": 10, "mode": "adaptive"},
+)
+
+
+def _patch_write_buffer():
+    """
+    通过环境变量 BOSS_WRITE_BUF 调大 HTTPConnection 的写缓冲区大小
+    默认缓冲区较小(http.client 为 8192),大文件上传时分片线程大量时间耗在小块写入与 GIL 竞争上
+    例: BOSS_WRITE_BUF=1048576 将缓冲区调整为 1MB,未设置时不做任何修改
+    """
+    write_buf = os.environ.get("BOSS_WRITE_BUF", "")
+    # 0 会导致每次读取 0 字节,请求体为空,因此只接受正整数
+    if not write_buf.isdigit() or int(write_buf) <= 0:
+        return
+    blocksize = int(write_buf)
+    # http.client.HTTPConnection 的 blocksize 为位置参数
+    init = http.client.HTTPConnection.__init__
+    arg_names = init.__code__.co_varnames[: init.__code__.co_argcount]
+    defaults = list(init.__defaults__)
+    defaults[arg_names.index("blocksize") - len(arg_names)] = blocksize
+    init.__defaults__ = tuple(defaults)
+    # urllib3 2.x 的 HTTPConnection 与 HTTPSConnection 各自定义了 blocksize 关键字参数默认值,
+    # botocore 的 http/https 连接分别基于这两个类
+    for connection_cls in (
+        urllib3.connection.HTTPConnection,
+        urllib3.connection.HTTPSConnection,
+    ):
+        kwdefaults = connection_cls.__init__.__kwdefaults__
+        if kwdefaults and "blocksize" in kwdefaults:
+            kwdefaults["blocksize"] = blocksize
+
+
+_patch_write_buffer()
+
+
+@functools.lru_cache(maxsize=None)
+def _get_client(
+    access_key: str,
+    secret_access_key: str,
+    region: str,
+    endpoint_url: str,
+    max_pool_connections: int = MAX_POOL_CONNECTIONS,
+):
+    """
+    按连接参数缓存 s3 client
+    session 和 client 的创建开销较大,相同参数的 OSSOperator 共享同一个 client
+    (client 为线程安全的)
+
+    Args:
+        access_key (str): access key
+        secret_access_key (str): secret access key
+        region (str): 区域
+        endpoint_url (str): oss 服务地址
+        max_pool_connections (int, optional): 连接池大小
+
+    Returns:
+        S3.Client: s3 client
+    """
+    session = Session(
+        aws_access_key_id=access_key,
+        aws_secret_access_key=secret_access_key,
+        region_name=region,
+    )
+    config = CLIENT_CONFIG
+    if max_pool_connections != MAX_POOL_CONNECTIONS:
+        config = config.merge(Config(max_pool_connections=max_pool_connections))
+    return session.client("s3", endpoint_url=endpoint_url, config=config)
+
+
+_CRT_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def _get_crt_manager(
+    access_key: str, secret_access_key: str, region: str, endpoint_url: str
+):
+    """
+    按连接参数缓存基于 aws-crt 的传输管理器,用于大文件上传
+    CRT 在 C 层完成分片读取与并发传输,不受 GIL 限制
+    =>首次上传大文件时才创建,进程退出时统一关闭
+
+    Args:
+        access_key (str): access key
+        secret_access_key (str): secret access key
+        region (str): 区域
+        endpoint_url (str): oss 服务地址,根据协议决定是否使用 TLS
+
+    Returns:
+        CRTTransferManager: 创建失败时返回None,回退到 boto3 传输
+    """
+    try:
+        botocore_session = botocore.session.get_session()
+        botocore_session.set_credentials(access_key, secret_access_key)
+        credentials_provider = BotocoreCRTCredentialsWrapper(
+            botocore_session.get_credentials()
+        ).to_crt_credentials_provider()
+        crt_client = create_s3_crt_client(
+            region,
+            crt_credentials_provider=credentials_provider,
+            use_ssl=urlparse(endpoint_url).scheme != "http",
+        )
+        serializer = BotocoreCRTRequestSerializer(
+            botocore_session,
+            client_kwargs={
+                "region_name": region,
+                "endpoint_url": endpoint_url,
+                "config": Config(s3={"addressing_style": "path"}),
+            },
+        )
+        crt_manager = CRTTransferManager(crt_client, serializer)
+        atexit.register(crt_manager.shutdown)
+        return crt_manager
+    except Exception as e:
+        logger.warning("create crt transfer manager failed: %r", e)
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def _get_operator(
+    cls,
+    access_key: str,
+    secret_access_key: str,
+    region: str,
+    endpoint_url: str,
+    bucket: str,
+    max_workers: int,
+):
+    """
+    按连接参数缓存 OSSOperator 实例,供 OSSOperator.from_cached 使用
+
+    Args:
+        cls (type): OSSOperator 或其子类
+        access_key (str): access key
+        secret_access_key (str): secret access key
+        region (str): 区域
+        endpoint_url (str): oss 服务地址
+        bucket (str): bucket 名称
+        max_workers (int): 并发线程数
+
+    Returns:
+        OSSOperator: 相同连接参数共享的实例
+    """
+    return cls(
+        {
+            "access_key": access_key,
+            "secret_access_key": secret_access_key,
+            "region": region,
+            "endpoint_url": endpoint_url,
+            "bucket": bucket,
+            "max_workers": max_workers,
+        }
+    )
+
 
 class OSSOperator:
     """
@@ -21,28 +220,58 @@ class OSSOperator:
         self.region = config.get("region", "")
         self.endpoint_url = config.get("endpoint_url", "")
         self.buckets = config.get("bucket", "")
-        self.session = Session(
-            aws_access_key_id=self.access_key,
-            aws_secret_access_key=self.secret_access_key,
-            region_name=self.region,
-        )
+        # 并发上传下载的线程数
+        self.max_workers = config.get("max_workers", DEFAULT_MAX_WORKERS)
+        if self.max_workers < 1:
+            raise ValueError(f"max_workers must be >= 1, got {self.max_workers}")
         self.error_message = ""
 
-        # 配置 config
-        self.session_config = Config(
-            s3={"addressing_style": "path"}, signature_version="s3v4"
+        # 连接池大小不小于线程数,避免多线程时连接被丢弃重建
+        pool_connections = max(self.max_workers, MAX_POOL_CONNECTIONS)
+
+        # 大文件使用分片并发传输
+        # 单文件操作独占连接池,分片并发数为 TRANSFER_CONCURRENCY
+        self.transfer_config = self.__transfer_config(TRANSFER_CONCURRENCY)
+        # 批量操作时 max_workers 个文件同时传输,
+        # 按连接池大小分配每个文件的分片并发数,保证 max_workers * 分片并发数 不超过连接池
+        self.batch_transfer_config = self.__transfer_config(
+            max(1, min(TRANSFER_CONCURRENCY, pool_connections // self.max_workers))
         )
 
-        self.client = self.session.client(
-            "s3",
-            endpoint_url=self.endpoint_url,
-            config=self.session_config,
+        self.client = _get_client(
+            self.access_key,
+            self.secret_access_key,
+            self.region,
+            self.endpoint_url,
+            pool_connections,
         )
+        # resource 构造开销较大,仅在调用 get_resource 时创建
+        self.resource = None
+
+    @classmethod
+    def from_cached(cls, config: dict) -> "OSSOperator":
+        """
+        获取相同连接参数共享的 OSSOperator 实例
+        适用于按请求创建 operator 的库调用场景,避免每次重新构建 client 等对象
+        =>缓存 key 只包含 access_key, secret_access_key, region, endpoint_url,
+          bucket, max_workers,其余配置项会被忽略
+        =>返回的实例被所有调用方共享,error_message 等实例属性也是共享的,
+          需要独立状态时请直接使用 OSSOperator(config)
+
+        Args:
+            config (dict): 与 __init__ 相同的配置项
 
-        self.resource = self.session.resource(
-            "s3",
-            endpoint_url=self.endpoint_url,
-            config=self.session_config,
+        Returns:
+            OSSOperator: 相同连接参数返回同一个实例
+        """
+        return _get_operator(
+            cls,
+            config.get("access_key", ""),
+            config.get("secret_access_key", ""),
+            config.get("region", ""),
+            config.get("endpoint_url", ""),
+            config.get("bucket", ""),
+            config.get("max_workers", DEFAULT_MAX_WORKERS),
         )
 
     @property
@@ -51,6 +280,17 @@ class OSSOperator:
 
     @property
     def get_resource(self) -> str:
+        if self.resource is None:
+            session = Session(
+                aws_access_key_id=self.access_key,
+                aws_secret_access_key=self.secret_access_key,
+                region_name=self.region,
+            )
+            self.resource = session.resource(
+                "s3",
+                endpoint_url=self.endpoint_url,
+                config=self.client.meta.config,
+            )
         return self.resource
 
     @property
@@ -58,84 +298,82 @@ class OSSOperator:
         return self.buckets
 
     def get_last_modified(self, path):
-        return self.resource.Object(self.buckets, path).last_modified
+        return self.client.head_object(Bucket=self.buckets, Key=path)["LastModified"]
 
     # TODO 增加 list 限制
     # !已废弃,不建议使用
     @property
     def list_files(self) -> list:
         file_paths = []
-        for item in self.resource.Bucket(self.buckets).objects.all():
-            file_paths.append(item.key)
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.buckets):
+            file_paths.extend(item["Key"] for item in page.get("Contents", []))
         return file_paths
 
     # 通过list_objects_v2实现文件列表获取
-    def list_dir_files(self, boss_dir: str) -> list:
+    def list_dir_files(self, boss_dir: str) -> Iterator[str]:
         """
         通过list_objects_v2实现文件列表获取
+        按页返回结果,调用方可以在list的同时开始下载/删除
 
         Args:
             boss_dir (str): 要获取的文件夹名称(可以只给出前缀,不强制要求写全)
             =>为保证只获取到对应的文件夹中的文件列表,使用时boss_dir尽量以"/"结尾
 
         Returns:
-            list: boss_dir文件夹下的所有文件的完整路径
+            Iterator[str]: boss_dir文件夹下的所有文件的完整路径
         """
-        files = []
-        is_truncated = True
-        continuation_token = ""
         # 去除对前缀的支持，强制要求传入参数为完整的文件夹名
         boss_dir = boss_dir.rstrip("/") + "/"
-        while is_truncated:
-            resp = self.client.list_objects_v2(
-                Bucket=self.buckets,
-                ContinuationToken=continuation_token,
-                MaxKeys=100,  # 通过每次 100 个请求以及偏移量的支持，优化list性能
-                StartAfter=boss_dir,
-            )
-            contents = resp["Contents"]
-            for item in contents:
-                if item["Key"].startswith(boss_dir):
-                    files.append(item["Key"])
-            if contents[-1]["Key"].startswith(boss_dir):
-                is_truncated = resp["IsTruncated"]
-            else:
-                is_truncated = False
-            continuation_token = resp["NextContinuationToken"] if is_truncated else ""
-        return files
+        paginator = self.client.get_paginator("list_objects_v2")
+        # 通过 Prefix 由服务端过滤,每页 1000 个(接口上限),减少请求次数
+        for page in paginator.paginate(
+            Bucket=self.buckets,
+            Prefix=boss_dir,
+            PaginationConfig={"PageSize": 1000},
+        ):
+            yield from (item["Key"] for item in page.get("Contents", []))
 
     def check_args(self) -> bool:
         """
-        通过list函数判断连接状态
-        =>原因为list_objects_v2开销较小
+        通过head_bucket判断连接状态
+        =>head_bucket不返回内容,只校验bucket是否存在及是否有权限
+        =>部分oss服务不支持head_bucket,此时回退到只list一个文件
 
         Returns:
             bool
         """
         try:
-            self.client.list_objects_v2(
-                Bucket=self.buckets,
-                ContinuationToken="",
-                MaxKeys=100,
-                StartAfter="",
-            )
-            print("args check success")
-            print(self.access_key)
-            print(self.secret_access_key)
-            print(self.buckets)
+            try:
+                self.client.head_bucket(Bucket=self.buckets)
+            except ClientError as e:
+                if e.response["Error"]["Code"] not in UNSUPPORTED_ERROR_CODES:
+                    raise
+                self.client.list_objects_v2(Bucket=self.buckets, MaxKeys=1)
+            logger.info("args check success")
+            logger.debug("access_key: %s, bucket: %s", self.access_key, self.buckets)
             return True
         except Exception as e:
             self.error_message = e
-            print(f"args check fail: {e=}")
+            logger.error("args check fail: %r", e)
             return False
 
-    def upload_single_file(self, file_path: str, upload_path: str) -> bool:
+    def upload_single_file(
+        self,
+        file_path: str,
+        upload_path: str,
+        skip_if_exists: bool = False,
+        transfer_config: TransferConfig = None,
+    ) -> bool:
         """
         上传单个文件到boss
+        oss本身为覆盖写,默认不检查boss文件是否存在,直接上传
 
         Args:
             file_path (str): 上传文件的本地路径
             upload_path (str): 上传的boss路径
+            skip_if_exists (bool, optional): boss文件已存在时跳过上传,会额外增加一次HEAD请求
+            transfer_config (TransferConfig, optional): 分片传输配置,None为使用self.transfer_config
 
         Raises:
             Exception: 所有异常
@@ -146,14 +384,24 @@ class OSSOperator:
         try:
             if not self.__local_file_exist(file_path):
                 raise Exception(f"File {file_path} not found")
-            # 去除上传检查逻辑,oss本身为覆盖写,此处删除为冗余操作
-            # if self.__boss_file_exist(upload_path):
-            #    self.resource.Object(self.buckets, upload_path).delete()
-            print(f"upload {file_path} -> {upload_path}")
-            self.resource.Object(self.buckets, upload_path).upload_file(file_path)
+            if skip_if_exists and self.__boss_file_exist(upload_path):
+                logger.debug("upload skip: boss file %s exist", upload_path)
+                return True
+            logger.debug("upload %s -> %s", file_path, upload_path)
+            if not (
+                HAS_CRT
+                and os.path.getsize(file_path) > CRT_THRESHOLD
+                and self.__crt_upload(file_path, upload_path)
+            ):
+                self.client.upload_file(
+                    file_path,
+                    self.buckets,
+                    upload_path,
+                    Config=transfer_config or self.transfer_config,
+                )
             return True
         except Exception as e:
-            print(f"upload single file failed: {e=}")
+            logger.error("upload single file failed: %r", e)
             return False
 
     def upload_files(self, file_list: list, path_list: list) -> bool:
@@ -175,14 +423,20 @@ class OSSOperator:
             # 输入两个参数的长度检查
             if len(file_list) != len(path_list):
                 raise Exception("file_list and path_list length not match")
-            for file, path in zip(file_list, path_list):
-                self.upload_single_file(file, path)
-            return True
+            return self.__run_parallel(
+                self.__batch_upload, zip(file_list, path_list)
+            )
         except Exception as e:
-            print(f"upload file failed: {e=}")
+            logger.error("upload file failed: %r", e)
             return False
 
-    def upload_dir(self, file_dir: str, upload_dir: str, ignore_re: str = None) -> bool:
+    def upload_dir(
+        self,
+        file_dir: str,
+        upload_dir: str,
+        ignore_re: str = None,
+        ignore_glob: str = None,
+    ) -> bool:
         """
         上传本地文件夹到boss
 
@@ -190,58 +444,64 @@ class OSSOperator:
             file_dir (str): 本地文件夹名
             upload_dir (str): boss文件夹名
             ignore_re (str, optional): 忽略规则,None为不忽略
-            =>
+            =>多个正则以","分隔,从文件名(相对路径)开头匹配任一规则即忽略
+            ignore_glob (str, optional): glob格式的忽略规则(如"*.log"),None为不忽略
+            =>多个规则以","分隔,与ignore_re任一匹配即忽略
 
         Returns:
             bool: 是否所有文件上传成功
         """
         try:
             file_names = self.__get_file_names_in_folder(file_dir)
-            upload_list = []
-            file_list = []
-            for file_name in file_names:
+            ignore_patterns = self.__compile_ignore(ignore_re, ignore_glob)
+            # 边遍历边提交上传任务,不需要先生成完整的文件列表
+            tasks = (
+                (
+                    os.path.join(file_dir, file_name),
+                    # boss key 始终以 "/" 分隔,与本地系统无关
+                    posixpath.join(upload_dir, file_name.replace(os.sep, "/")),
+                )
+                for file_name in file_names
                 # 使用正则判断忽略文件，并跳过
-                if ignore_re:
-                    is_ignore = False
-                    ignore_rules = ignore_re.split(",")
-                    for ignore_rule in ignore_rules:
-                        if self.__match_file_name(file_name, ignore_rule):
-                            is_ignore = True
-                            break
-                    if is_ignore:
-                        continue
-                upload_list.append(upload_dir + "/" + file_name)
-                file_list.append(file_dir + "/" + file_name)
-            self.upload_files(file_list, upload_list)
-            return True
+                if not any(pattern.match(file_name) for pattern in ignore_patterns)
+            )
+            return self.__run_parallel(self.__batch_upload, tasks)
         except Exception as e:
-            print(f"upload dir failed: {e=}")
+            logger.error("upload dir failed: %r", e)
             return False
 
-    def download_single_file(self, file: str, path: str) -> bool:
+    def download_single_file(
+        self,
+        file: str,
+        path: str,
+        skip_if_exists: bool = False,
+        transfer_config: TransferConfig = None,
+    ) -> bool:
         """
         下载boss文件到本地
+        不再预先检查boss文件是否存在,文件不存在时下载会直接抛出404异常
+        本地文件已存在时直接覆盖(下载先写入临时文件,完成后再替换)
 
         Args:
             file (str): boss上的文件路径
             path (str): 下载到本地的路径
+            skip_if_exists (bool, optional): 本地文件已存在时跳过下载
+            transfer_config (TransferConfig, optional): 分片传输配置,None为使用self.transfer_config
 
         Returns:
             bool: 文件下载是否成功
         """
         try:
-            if not self.__local_file_exist(path) and self.__boss_file_exist(file):
-                self.resource.Object(self.buckets, file).download_file(path)
-                print(f"download success: {file} -> {path}")
-            elif self.__local_file_exist(path):
-                os.remove(path)
-                self.resource.Object(self.buckets, file).download_file(path)
-                print(f"download success: {file} -> {path}")
-            else:
-                print(f"download failed: boss file {file} not exist")
+            if skip_if_exists and self.__local_file_exist(path):
+                logger.debug("download skip: local file %s exist", path)
+                return True
+            self.client.download_file(
+                self.buckets, file, path, Config=transfer_config or self.transfer_config
+            )
+            logger.debug("download success: %s -> %s", file, path)
             return True
         except Exception as e:
-            print(f"download single file failed: {e=}")
+            logger.error("download single file failed: %r", e)
             return False
 
     def download_dir(self, boss_dir: str, local_dir: str) -> bool:
@@ -256,47 +516,70 @@ class OSSOperator:
             bool: 文件夹下载是否成功
         """
         try:
+            # Prefix 保证所有 key 都以 boss_dir/ 开头,直接切片得到相对路径
+            prefix_len = len(boss_dir.rstrip("/")) + 1
             boss_files = self.list_dir_files(boss_dir)
-            self.__mkdir(local_dir)
-            for file in boss_files:
-                local_file = file.replace(boss_dir, local_dir)
-                file_dir = "/".join(local_file.split("/")[:-1])
-                self.__mkdir(file_dir)
-                self.download_single_file(file, local_file)
-            return True
+
+            def tasks():
+                for file in boss_files:
+                    # 以 "/" 结尾的 key 为文件夹标记对象,不需要下载
+                    if file.endswith("/"):
+                        continue
+                    local_file = self.__local_path(local_dir, file, prefix_len)
+                    if local_file:
+                        yield file, local_file
+
+            return self.__run_parallel(
+                self.__batch_download, self.__makedirs(local_dir, tasks())
+            )
         except Exception as e:
-            print(f"download dir failed: {e=}")
+            logger.error("download dir failed: %r", e)
             return False
 
-    def download_dir_with_ignore(self, boss_dir, local_dir, ignore) -> bool:
+    def download_dir_with_ignore(
+        self, boss_dir, local_dir, ignore=(), ignore_glob: str = None
+    ) -> bool:
         """
-        下载boss文件夹到本地，忽略满足以 ignore 结尾的文件
-        目前仅支持后缀匹配
-        TODO: 增加正则支持
+        下载boss文件夹到本地，忽略满足以 ignore 结尾或匹配 ignore_glob 的文件
 
         Args:
             boss_dir (str): boss上的文件夹路径
             local_dir (str): 下载到本地的路径
+            ignore (str | tuple, optional): 忽略的文件后缀,支持传入多个后缀
+            ignore_glob (str, optional): glob格式的忽略规则,多个规则以","分隔
+            =>glob规则匹配boss_dir下的相对路径
 
         Returns:
             bool: 文件夹下载是否成功
         """
         try:
+            # str.endswith 支持直接传入后缀元组,一次调用完成所有后缀判断
+            suffixes = (ignore,) if isinstance(ignore, str) else tuple(ignore)
+            ignore_patterns = self.__compile_ignore(ignore_glob=ignore_glob)
+            # Prefix 保证所有 key 都以 boss_dir/ 开头,直接切片得到相对路径
+            prefix_len = len(boss_dir.rstrip("/")) + 1
             boss_files = self.list_dir_files(boss_dir)
-            # mkdir 保证本地下载文件夹存在，不创建直接下载会失败
-            self.__mkdir(local_dir)
-            for file in boss_files:
-                if file.endswith(ignore):
-                    print(f"{file} ignore")
-                    continue
-                local_file = file.replace(boss_dir, local_dir)
-                file_dir = "/".join(local_file.split("/")[:-1])
-                # 用于子文件夹的创建
-                self.__mkdir(file_dir)
-                self.download_single_file(file, local_file)
-            return True
+
+            def tasks():
+                for file in boss_files:
+                    # 以 "/" 结尾的 key 为文件夹标记对象,不需要下载
+                    if file.endswith("/"):
+                        continue
+                    if file.endswith(suffixes) or any(
+                        pattern.match(file[prefix_len:]) for pattern in ignore_patterns
+                    ):
+                        logger.debug("%s ignore", file)
+                        continue
+                    local_file = self.__local_path(local_dir, file, prefix_len)
+                    if local_file:
+                        yield file, local_file
+
+            # 保证本地下载文件夹及子文件夹存在，不创建直接下载会失败
+            return self.__run_parallel(
+                self.__batch_download, self.__makedirs(local_dir, tasks())
+            )
         except Exception as e:
-            print(f"downloda dir with ignore failed: {e=}")
+            logger.error("downloda dir with ignore failed: %r", e)
             return False
 
     def delete_single_file(self, file_path: str) -> bool:
@@ -310,33 +593,46 @@ class OSSOperator:
             bool: 删除是否成功
         """
         try:
-            self.resource.Object(self.buckets, file_path).delete()
-            if self.__boss_file_exist(file_path):
-                print(f"boss file {file_path} delete fail")
-                return False
-            else:
-                print(f"boss file {file_path} delete success")
-                return True
+            # 删除失败时 delete_object 会直接抛出异常,无需再次检查文件是否存在
+            self.client.delete_object(Bucket=self.buckets, Key=file_path)
+            logger.debug("boss file %s delete success", file_path)
+            return True
         except Exception as e:
-            print(f"delete single file failed: {e=}")
+            logger.error("delete single file failed: %r", e)
             return False
 
-    def delete_files(self, file_list: list) -> bool:
+    def delete_files(self, file_list: Iterable[str]) -> bool:
         """
         删除boss文件列表
 
         Args:
-            file_list (list): boss文件列表
+            file_list (Iterable[str]): boss文件列表,支持传入生成器
+            =>通过delete_objects批量删除,每1000个文件一次请求
 
         Returns:
             bool: 删除是否成功
         """
         try:
-            for file in file_list:
-                self.delete_single_file(file)
-            return True
+            success = True
+            files = iter(file_list)
+            # delete_objects 单次最多支持 1000 个对象
+            for chunk in iter(lambda: list(islice(files, DELETE_BATCH_SIZE)), []):
+                resp = self.client.delete_objects(
+                    Bucket=self.buckets,
+                    Delete={
+                        "Objects": [{"Key": key} for key in chunk],
+                        "Quiet": True,
+                    },
+                )
+                # Quiet 模式下只返回删除失败的对象
+                for error in resp.get("Errors", []):
+                    success = False
+                    logger.error(
+                        "boss file %s delete fail: %s", error["Key"], error.get("Message")
+                    )
+            return success
         except Exception as e:
-            print(f"delete files failed: {e=}")
+            logger.error("delete files failed: %r", e)
             return False
 
     def delete_dir(self, boss_dir: str) -> bool:
@@ -350,26 +646,177 @@ class OSSOperator:
             bool: 删除是否成功
         """
         try:
+            # list 在 delete_files 中边遍历边执行,list 失败同样会使 delete_files 返回 False
             files = self.list_dir_files(boss_dir)
-            self.delete_files(files)
-            print(f"delete {boss_dir} success")
+            if not self.delete_files(files):
+                logger.error("delete %s fail", boss_dir)
+                return False
+            logger.info("delete %s success", boss_dir)
             return True
         except Exception as e:
-            print(f"delete dir failed: {e=}")
+            logger.error("delete dir failed: %r", e)
             return False
 
-    def __mkdir(self, path: str):
+    def __crt_upload(self, file_path: str, upload_path: str) -> bool:
         """
-        创建文件夹，用于本地文件存储
+        通过 aws-crt 上传大文件
 
         Args:
-            path (str): 需要创建的文件夹路径
+            file_path (str): 上传文件的本地路径
+            upload_path (str): 上传的boss路径
+
+        Returns:
+            bool: 是否上传成功,失败时由调用方回退到 boto3 传输
         """
-        # 判断文件夹是否存在
-        folder = os.path.exists(path)
-        # 不存在则创建
-        if not folder:
-            os.makedirs(path)
+        # 多个上传线程可能同时首次创建,加锁保证每组连接参数只创建一个
+        with _CRT_LOCK:
+            crt_manager = _get_crt_manager(
+                self.access_key, self.secret_access_key, self.region, self.endpoint_url
+            )
+        if crt_manager is None:
+            return False
+        try:
+            crt_manager.upload(file_path, self.buckets, upload_path).result()
+            return True
+        except Exception as e:
+            logger.warning("crt upload failed, fall back to boto3: %r", e)
+            return False
+
+    def __transfer_config(self, max_concurrency: int) -> TransferConfig:
+        """
+        构建分片传输配置
+
+        Args:
+            max_concurrency (int): 单个文件分片传输的最大并发数
+
+        Returns:
+            TransferConfig: 分片传输配置
+        """
+        return TransferConfig(
+            multipart_threshold=8 * 1024 * 1024,
+            multipart_chunksize=16 * 1024 * 1024,
+            max_concurrency=max_concurrency,
+            use_threads=True,
+        )
+
+    def __batch_upload(self, file_path: str, upload_path: str) -> bool:
+        """
+        批量上传中的单文件上传,使用降低分片并发数后的传输配置
+        """
+        return self.upload_single_file(
+            file_path, upload_path, transfer_config=self.batch_transfer_config
+        )
+
+    def __batch_download(self, file: str, path: str) -> bool:
+        """
+        批量下载中的单文件下载,使用降低分片并发数后的传输配置
+        """
+        return self.download_single_file(
+            file, path, transfer_config=self.batch_transfer_config
+        )
+
+    def __run_parallel(self, func, args_list) -> bool:
+        """
+        使用线程池并发执行单文件操作
+        client 为线程安全的,所有线程共享同一个 self.client
+        =>同时在执行的任务数不超过 max_workers * 2,每完成一个就补充一个,
+          避免个别慢文件阻塞整批任务,也不会一次性提交全部任务
+
+        Args:
+            func (callable): 单文件操作函数,返回值为bool
+            args_list (iterable): 每次调用func的参数元组
+
+        Returns:
+            bool: 是否所有操作都成功
+        """
+        success = True
+        args_iter = iter(args_list)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(func, *args)
+                for args in islice(args_iter, self.max_workers * 2)
+            }
+            while futures:
+                done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if not future.result():
+                        success = False
+                for args in islice(args_iter, len(done)):
+                    futures.add(executor.submit(func, *args))
+        return success
+
+    def __local_path(self, local_dir: str, file: str, prefix_len: int) -> str:
+        """
+        将boss文件路径映射为local_dir下的本地路径
+        key 中可能包含 "//" 或 ".." (如 "dir//tmp/x"),直接 join 会写到 local_dir 之外,
+        此类文件跳过并记录错误
+
+        Args:
+            local_dir (str): 本地下载根目录
+            file (str): boss文件路径
+            prefix_len (int): boss_dir/ 前缀长度
+
+        Returns:
+            str: 本地文件路径,超出local_dir时返回None
+        """
+        local_file = os.path.normpath(
+            os.path.join(local_dir, file[prefix_len:].lstrip("/"))
+        )
+        root = os.path.abspath(local_dir)
+        local_abs = os.path.abspath(local_file)
+        if local_abs == root or os.path.commonpath([root, local_abs]) != root:
+            logger.error("skip %s: local path outside %s", file, local_dir)
+            return None
+        return local_file
+
+    def __makedirs(self, local_dir: str, tasks: Iterable[tuple]) -> Iterator[tuple]:
+        """
+        创建下载所需的本地文件夹,并原样返回下载任务
+        记录已创建的文件夹,每个文件夹只调用一次 makedirs,
+        任务在对应文件夹创建后才会被提交下载
+
+        Args:
+            local_dir (str): 本地下载根目录
+            tasks (Iterable[tuple]): (boss文件路径, 本地文件路径)
+
+        Returns:
+            Iterator[tuple]: (boss文件路径, 本地文件路径)
+        """
+        os.makedirs(local_dir, exist_ok=True)
+        file_dirs = {local_dir}
+        for file, local_file in tasks:
+            file_dir = os.path.dirname(local_file)
+            if file_dir not in file_dirs:
+                os.makedirs(file_dir, exist_ok=True)
+                file_dirs.add(file_dir)
+            yield file, local_file
+
+    def __compile_ignore(self, ignore_re: str = None, ignore_glob: str = None):
+        """
+        编译忽略规则,只编译一次
+        =>正则规则逐条编译,合并会破坏行内flag(如"(?i)")和反向引用的语义
+        =>glob规则由fnmatch.translate生成,可以安全合并为一个正则
+
+        Args:
+            ignore_re (str, optional): 正则规则,多个规则以","分隔
+            ignore_glob (str, optional): glob规则,多个规则以","分隔
+
+        Returns:
+            list: 编译后的正则列表,无规则时返回空列表
+        """
+        patterns = []
+        if ignore_re:
+            patterns.extend(re.compile(rule) for rule in ignore_re.split(","))
+        if ignore_glob:
+            patterns.append(
+                re.compile(
+                    "|".join(
+                        f"(?:{fnmatch.translate(rule)})"
+                        for rule in ignore_glob.split(",")
+                    )
+                )
+            )
+        return patterns
 
     def __boss_file_exist(self, file_path: str) -> bool:
         """
@@ -382,23 +829,33 @@ class OSSOperator:
             bool: boss文件存在与否,存在返回True
 
         Raises:
-            ClientError:404表示文件对象不存在
+            ClientError:除404外的其他异常(如权限问题)直接抛出
         """
-        try:
-            self.resource.Object(self.buckets, file_path).load()
-            print(f"archimedes: file {file_path} exist!")
+        if self.boss_file_exist(file_path):
+            logger.debug("archimedes: file %s exist!", file_path)
             return True
-        except ClientError as e:
-            if e.response["Error"]["Code"] == "404":
-                return False
+        return False
 
     def boss_file_exist(self, file_path: str) -> bool:
+        """
+        通过head_object判断 boss 文件是否存在
+
+        Args:
+            file_path (str): boss文件路径
+
+        Returns:
+            bool: boss文件存在与否,存在返回True
+
+        Raises:
+            ClientError:除404外的其他异常(如权限问题)直接抛出
+        """
         try:
-            self.resource.Object(self.buckets, file_path).load()
+            self.client.head_object(Bucket=self.buckets, Key=file_path)
             return True
         except ClientError as e:
-            if e.response["Error"]["Code"] == "404":
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
                 return False
+            raise
 
     def __local_file_exist(self, file_path: str) -> bool:
         """
@@ -415,34 +872,25 @@ class OSSOperator:
         else:
             return False
 
-    def __get_file_names_in_folder(self, folder_path: str) -> list:
+    def __get_file_names_in_folder(self, folder_path: str) -> Iterator[str]:
         """
-        获取文件夹中所有文件的文件名列表
+        获取文件夹中所有文件的文件名(相对路径)
+        基于 os.scandir 迭代遍历,利用 DirEntry 缓存的文件类型减少 stat 调用
+        与 os.walk 一致,不进入软链接指向的文件夹
 
         Args:
             folder_path (str): 文件夹路径
 
         Returns:
-            list: 文件名列表
-        """
-        file_paths = []
-        for root, dirs, files in os.walk(folder_path):
-            for file in files:
-                file_path = os.path.join(root, file)
-                file_paths.append(os.path.relpath(file_path, folder_path))
-        return file_paths
-
-    def __match_file_name(self, file_name: str, pattern: str) -> bool:
-        """
-        正则匹配文件名
-
-        Args:
-            file_name (str): 文件名
-            pattern (str): 正则表达式
-
-        Returns:
-            bool: 是否能匹配到结果
-        """
-        # 使用正则表达式匹配文件名
-        match = re.match(pattern, file_name)
-        return bool(match)
+            Iterator[str]: 文件名生成器
+        """
+        prefix_len = len(os.path.join(folder_path, ""))
+        dirs = [folder_path]
+        while dirs:
+            with os.scandir(dirs.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        if not entry.is_symlink():
+                            dirs.append(entry.path)
+                    else:
+                        yield entry.path[prefix_len:]
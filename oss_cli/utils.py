@@ -1,4 +1,8 @@
+import atexit
+import logging
 import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
 
 def check_file_exists(file_path):
     if os.path.exists(file_path):
@@ -6,4 +10,24 @@ def check_file_exists(file_path):
         return True
     else:
         # print(f"The file '{file_path}' does not exist.")
-        return False
\ No newline at end of file
+        return False
+
+
+def setup_logger(verbose=False):
+    """
+    配置 oss_cli 的日志输出
+    日志先写入队列,由后台线程统一输出,多线程上传下载时写日志不会阻塞
+    verbose 为 True 时输出每个文件的操作日志(DEBUG),否则只输出汇总和错误信息
+    """
+    log_queue = queue.Queue(-1)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = QueueListener(log_queue, stream_handler)
+    listener.start()
+    # 退出前输出队列中剩余的日志
+    atexit.register(listener.stop)
+
+    logger = logging.getLogger("oss_cli")
+    logger.addHandler(QueueHandler(log_queue))
+    logger.setLevel(logging.DEBUG if verbose else logging.INFO)
+    return logger
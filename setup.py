@@ -10,6 +10,9 @@ setup(
         'pyyaml',
         'boto3',
     ],
+    extras_require={
+        'crt': ['boto3[crt]'],
+    },
     python_requires='>=3.7',
     entry_points={
         'console_scripts': [